@@ -3,6 +3,7 @@
 This takes doctest files and turns them into standalone scripts.
 """
 import doctest
+import multiprocessing
 import os
 import sys
 
@@ -16,18 +17,22 @@ __maintainer__ = "Gavin Huttley"
 __email__ = "gavin.huttley@anu.edu.au"
 __status__ = "Production"
 
-for filename in sys.argv[1:]:
-    print(filename)
+
+def convert(filename):
+    """writes the doctest examples in filename to a .py file of the same name"""
     (name, suffix) = os.path.splitext(filename)
     if suffix != ".rst":
-        print("not a .rst file")
-        continue
-    f = open(filename, "r")
-    s = "".join(f.readlines())
-    f.close()
+        return f"{filename}\nnot a .rst file"
+    with open(filename, "r") as f:
+        s = f.read()
 
     s = doctest.script_from_examples(s)
-    f = open(name + ".py", "w")
-    f.write(s)
-    f.close()
-    print("->", name + ".py")
+    with open(name + ".py", "w") as f:
+        f.write(s)
+    return f"{filename}\n-> {name}.py"
+
+
+if __name__ == "__main__":
+    with multiprocessing.Pool() as pool:
+        for result in pool.imap_unordered(convert, sys.argv[1:]):
+            print(result)
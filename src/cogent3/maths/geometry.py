@@ -3,25 +3,33 @@
 
 from numpy import (
     any,
-    append,
+    arange,
     array,
+    asarray,
+    atleast_2d,
+    broadcast_to,
     cos,
     delete,
+    empty,
     exp,
+    float64,
     insert,
-    linalg,
     log,
-    mean,
     min,
+    ndim,
     newaxis,
     nonzero,
+    ones,
     pi,
     sin,
     sqrt,
     sum,
-    take,
+    where,
+    zeros,
 )
 
+from .geometry_numba import aitchison_distance_rows, clr_rows
+
 
 __author__ = "Sandra Smit"
 __copyright__ = "Copyright 2007-2022, The Cogent Project"
@@ -67,9 +75,9 @@ def center_of_mass_one_array(data, weight_idx=-1):
     data = array(data)
     coord_idx = list(range(data.shape[1]))
     del coord_idx[weight_idx]
-    coordinates = take(data, (coord_idx), 1)
-    weights = take(data, (weight_idx,), 1)
-    return sum(coordinates * weights, 0) / sum(weights, 0)
+    coordinates = data[:, coord_idx]
+    weights = data[:, weight_idx]
+    return (coordinates * weights[:, newaxis]).sum(0) / weights.sum()
 
 
 def center_of_mass_two_array(coordinates, weights):
@@ -116,29 +124,69 @@ def sphere_points(n):
     return array(points)
 
 
+def _normalise_cols(col, size):
+    """returns col as integer indices, with negative values counted from size
+
+    Raises IndexError if any index is outside -size <= col < size."""
+    col = asarray(col)
+    if col.size == 0:
+        col = col.astype(int)
+    if col.dtype.kind not in "iu":
+        raise TypeError("col must be an int or a sequence of int")
+    if any((col < -size) | (col >= size)):
+        raise IndexError(f"col out of range for a composition of length {size}")
+    return where(col < 0, col + size, col)
+
+
+def _broadcast_rows(x, col, size):
+    """returns x as a 2D array and col as one non-negative index per row
+
+    A 1D x, or a 2D x with a single row, is repeated to match the number
+    of indices in col."""
+    col = _normalise_cols(col, size)
+    if col.ndim > 1:
+        raise ValueError("col must be an int or a 1D sequence of int")
+    x = atleast_2d(x)
+    num_rows = col.shape[0] if col.ndim == 1 and x.shape[0] == 1 else x.shape[0]
+    x = broadcast_to(x, (num_rows, x.shape[1]))
+    cols = broadcast_to(col, (num_rows,))
+    return x, cols
+
+
 def alr(x, col=-1):
     r"""
     Additive log ratio (alr) Aitchison transformation.
     Parameters
     ----------
     x: numpy.ndarray
-       A composition (sum = 1)
-    col: int
+       A composition (sum = 1), or a 2D array with one composition
+       per row
+    col: int or sequence of int
        The index of the position (vector) of x used in the
        denominator for alr transformations. Defaults to -1,
        i.e. last component of composition as is conventional.
+       If a sequence, the transformation is applied row-wise with
+       one index per row of x (a 1D x is repeated for each index).
     Returns
     -------
     numpy.ndarray
          alr-transformed data projected into R^(n-1)."""
     x = x.squeeze()
-    if x.ndim != 1:
-        raise ValueError("Input array must be 1D")
+    if x.ndim not in (1, 2):
+        raise ValueError("Input array must be 1D or 2D")
     if any(x <= 0):
         raise ValueError("Cannot have negative or zero proportions")
     logx = log(x)
-    logx_short = delete(logx, col)
-    return (logx_short - logx[col]).squeeze()
+    if logx.ndim == 1 and ndim(col) == 0:
+        logx_short = delete(logx, col)
+        return (logx_short - logx[col]).squeeze()
+
+    logx, cols = _broadcast_rows(logx, col, logx.shape[-1])
+    rows = arange(logx.shape[0])
+    keep = ones(logx.shape, dtype=bool)
+    keep[rows, cols] = False
+    logx_short = logx[keep].reshape(logx.shape[0], logx.shape[1] - 1)
+    return logx_short - logx[rows, cols][:, newaxis]
 
 
 def clr(x):
@@ -147,20 +195,22 @@ def clr(x):
     Parameters
     ----------
     x: numpy.ndarray
-       A composition (sum = 1)
+       A composition (sum = 1), or a 2D array with one composition
+       per row
     Returns
     -------
     numpy.ndarray
          clr-transformed data projected to hyperplane x1 + ... + xn=0."""
 
     x = x.squeeze()
-    if x.ndim != 1:
-        raise ValueError("Input array must be 1D")
+    if x.ndim not in (1, 2):
+        raise ValueError("Input array must be 1D or 2D")
     if any(x <= 0):
         raise ValueError("Cannot have negative or zero proportions")
-    logx = log(x)
-    gx = mean(logx)
-    return (logx - gx).squeeze()
+    data = array(x, dtype=float64, ndmin=2)
+    result = empty(data.shape, dtype=float64)
+    clr_rows(data, result)
+    return result if x.ndim == 2 else result[0]
 
 
 def clr_inv(x):
@@ -189,25 +239,38 @@ def alr_inv(x, col=-1):
     Parameters
     ----------
     x: numpy.ndarray
-       A real vector which is a transformed compositions.
-    col: int
+       A real vector which is a transformed compositions, or a 2D
+       array with one such vector per row.
+    col: int or sequence of int
        The index of the position (vector) of x used in the
        denominator for alr transformations. Defaults to -1,
        i.e. last component of composition as is conventional.
+       The index is into the returned composition, which is one
+       longer than x, so negative values count from its end (as
+       for alr). If a sequence, the transformation is applied
+       row-wise with one index per row of x (a 1D x is repeated
+       for each index).
     Returns
     -------
     numpy.ndarray
          A composition (sum = 1)."""
     x = x.squeeze()
-    if x.ndim != 1:
-        raise ValueError("Input array must be 1D")
-    if col == -1:
-        x = append(x, 0)
-    else:
-        x = insert(x, col, 0)
-    ex = exp(x)
-    sumexp = sum(ex)
-    return ex / sumexp
+    if x.ndim not in (1, 2):
+        raise ValueError("Input array must be 1D or 2D")
+    if x.ndim == 1 and ndim(col) == 0:
+        x = insert(x, int(_normalise_cols(col, x.shape[0] + 1)), 0)
+        ex = exp(x)
+        sumexp = sum(ex)
+        return ex / sumexp
+
+    x, cols = _broadcast_rows(x, col, x.shape[-1] + 1)
+    num_rows, num_cols = x.shape
+    keep = ones((num_rows, num_cols + 1), dtype=bool)
+    keep[arange(num_rows), cols] = False
+    ex = zeros(keep.shape)
+    ex[keep] = x.ravel()
+    ex = exp(ex)
+    return ex / sum(ex, axis=1)[:, newaxis]
 
 
 def aitchison_distance(x, y):
@@ -216,11 +279,12 @@ def aitchison_distance(x, y):
     Parameters
     ----------
     x, y: numpy.ndarrays
-       Compositions
+       Compositions, or 2D arrays with one composition per row
     Returns
     -------
-    numpy.float64
-         A real value of this distance metric >= 0."""
+    numpy.float64 or numpy.ndarray
+         A real value of this distance metric >= 0, or the distance
+         between each corresponding pair of rows for 2D input."""
     if any(x <= 0):
         raise ValueError(
             "Cannot have negative \
@@ -231,7 +295,13 @@ def aitchison_distance(x, y):
             "Cannot have negative \
                 or zero proportions - parameter 1."
         )
-    return linalg.norm(clr(x / y))
+    x = array(x, dtype=float64).squeeze()
+    y = array(y, dtype=float64).squeeze()
+    if x.ndim not in (1, 2) or x.shape != y.shape:
+        raise ValueError("Inputs must be 1D or 2D arrays of the same shape")
+    result = empty(x.shape[0] if x.ndim == 2 else 1, dtype=float64)
+    aitchison_distance_rows(atleast_2d(x), atleast_2d(y), result)
+    return result if x.ndim == 2 else result[0]
 
 
 def multiplicative_replacement(x, eps=0.01):
@@ -254,6 +324,7 @@ def multiplicative_replacement(x, eps=0.01):
     delta = min(x[nonzero(x)]) * eps
     if delta < 0:
         raise ValueError("Cannot have negative proportions.")
-    shape_zeros = x < delta
-    y = x + shape_zeros * delta
-    return y / sum(y)
+    y = array(x, dtype=float64)
+    y[y < delta] += delta
+    y /= sum(y)
+    return y
@@ -0,0 +1,50 @@
+import numpy
+
+from numba import njit
+
+
+__author__ = "Helmut Simon"
+__copyright__ = "Copyright 2007-2022, The Cogent Project"
+__credits__ = ["Helmut Simon", "Gavin Huttley"]
+__license__ = "BSD-3"
+__version__ = "2022.5.25a1"
+__maintainer__ = "Gavin Huttley"
+__email__ = "Gavin.Huttley@anu.edu.au"
+__status__ = "Alpha"
+
+# turn off code coverage as njit-ted code not accessible to coverage
+
+
+@njit(cache=True)
+def clr_rows(x, out):  # pragma: no cover
+    """writes the clr transform of each row of x into out"""
+    num_rows, num_cols = x.shape
+    for i in range(num_rows):
+        gx = 0.0
+        for j in range(num_cols):
+            out[i, j] = numpy.log(x[i, j])
+            gx += out[i, j]
+        gx /= num_cols
+        for j in range(num_cols):
+            out[i, j] -= gx
+
+
+@njit(cache=True)
+def aitchison_distance_rows(x, y, out):  # pragma: no cover
+    """writes the norm of clr(x[i] / y[i]) for each row i into out
+
+    Uses clr(x) - clr(y) == log(x / y) - mean(log(x / y)), so x and y are
+    read once and only a single row buffer is allocated."""
+    num_rows, num_cols = x.shape
+    log_ratio = numpy.empty(num_cols)
+    for i in range(num_rows):
+        mean_log_ratio = 0.0
+        for j in range(num_cols):
+            log_ratio[j] = numpy.log(x[i, j] / y[i, j])
+            mean_log_ratio += log_ratio[j]
+        mean_log_ratio /= num_cols
+        total = 0.0
+        for j in range(num_cols):
+            diff = log_ratio[j] - mean_log_ratio
+            total += diff * diff
+        out[i] = numpy.sqrt(total)
@@ -3,9 +3,10 @@
 from math import sqrt
 from unittest import TestCase, main
 
-from numpy import allclose, arange, array, insert, isclose, sum, take
+import numpy
+
 from numpy.linalg import norm
-from numpy.random import choice, dirichlet
+from numpy.random import default_rng
 from numpy.testing import assert_allclose, assert_equal
 
 from cogent3.maths.geometry import (
@@ -38,22 +39,26 @@ class CenterOfMassTests(TestCase):
 
     def setUp(self):
         """setUp for all CenterOfMass tests"""
-        self.simple = array([[1, 1, 1], [3, 1, 1], [2, 3, 2]])
+        self.simple = numpy.array([[1, 1, 1], [3, 1, 1], [2, 3, 2]])
         self.simple_list = [[1, 1, 1], [3, 1, 1], [2, 3, 2]]
-        self.more_weight = array([[1, 1, 3], [3, 1, 3], [2, 3, 50]])
-        self.square = array([[1, 1, 25], [3, 1, 25], [3, 3, 25], [1, 3, 25]])
-        self.square_odd = array([[1, 1, 25], [3, 1, 4], [3, 3, 25], [1, 3, 4]])
-        self.sec_weight = array([[1, 25, 1], [3, 25, 1], [3, 25, 3], [1, 25, 3]])
+        self.more_weight = numpy.array([[1, 1, 3], [3, 1, 3], [2, 3, 50]])
+        self.square = numpy.array([[1, 1, 25], [3, 1, 25], [3, 3, 25], [1, 3, 25]])
+        self.square_odd = numpy.array([[1, 1, 25], [3, 1, 4], [3, 3, 25], [1, 3, 4]])
+        self.sec_weight = numpy.array([[1, 25, 1], [3, 25, 1], [3, 25, 3], [1, 25, 3]])
 
     def test_center_of_mass_one_array(self):
         """center_of_mass_one_array should behave correctly"""
         com1 = center_of_mass_one_array
-        assert_equal(com1(self.simple), array([2, 2]))
-        assert_equal(com1(self.simple_list), array([2, 2]))
-        assert_allclose(com1(self.more_weight), array([2, 2.785714]), rtol=1e-6)
-        assert_equal(com1(self.square), array([2, 2]))
-        assert_equal(com1(self.square_odd), array([2, 2]))
-        assert_equal(com1(self.sec_weight, 1), array([2, 2]))
+        assert_equal(com1(self.simple), numpy.array([2, 2]))
+        assert_equal(com1(self.simple_list), numpy.array([2, 2]))
+        assert_allclose(com1(self.more_weight), numpy.array([2, 2.785714]), rtol=1e-6)
+        assert_equal(com1(self.square), numpy.array([2, 2]))
+        assert_equal(com1(self.square_odd), numpy.array([2, 2]))
+        assert_equal(com1(self.sec_weight, 1), numpy.array([2, 2]))
+        # zero total weight gives nan, not an exception
+        with numpy.errstate(invalid="ignore"):
+            got = com1(numpy.array([[1, 1, 0], [3, 1, 0]]))
+        assert numpy.isnan(got).all()
 
     def test_CoM_one_array_wrong(self):
         """center_of_mass_one_array should fail on wrong input"""
@@ -66,11 +71,11 @@ class CenterOfMassTests(TestCase):
     def test_center_of_mass_two_array(self):
         """center_of_mass_two_array should behave correctly"""
         com2 = center_of_mass_two_array
-        coor = take(self.square_odd, (0, 1), 1)
-        weights = take(self.square_odd, (2,), 1)
-        assert_equal(com2(coor, weights), array([2, 2]))
+        coor = numpy.take(self.square_odd, (0, 1), 1)
+        weights = numpy.take(self.square_odd, (2,), 1)
+        assert_equal(com2(coor, weights), numpy.array([2, 2]))
         weights = weights.ravel()
-        assert_equal(com2(coor, weights), array([2, 2]))
+        assert_equal(com2(coor, weights), numpy.array([2, 2]))
 
     def test_CoM_two_array_wrong(self):
         """center_of_mass_two_array should fail on wrong input"""
@@ -87,8 +92,8 @@ class CenterOfMassTests(TestCase):
         assert_equal(com(self.simple), com1(self.simple))
         assert_allclose(com(self.more_weight), com1(self.more_weight))
         assert_equal(com(self.sec_weight, 1), com1(self.sec_weight, 1))
-        coor = take(self.square_odd, (0, 1), 1)
-        weights = take(self.square_odd, (2,), 1)
+        coor = numpy.take(self.square_odd, (0, 1), 1)
+        weights = numpy.take(self.square_odd, (2,), 1)
         assert_equal(com(coor, weights), com2(coor, weights))
         weights = weights.ravel()
         assert_equal(com(coor, weights), com2(coor, weights))
@@ -96,19 +101,19 @@ class CenterOfMassTests(TestCase):
     def test_distance(self):
         """distance should return Euclidean distance correctly."""
         # for single dimension, should return difference
-        a1 = array([3])
-        a2 = array([-1])
+        a1 = numpy.array([3])
+        a2 = numpy.array([-1])
         self.assertEqual(distance(a1, a2), 4)
         # for two dimensions, should work e.g. for 3, 4, 5 triangle
-        a1 = array([0, 0])
-        a2 = array([3, 4])
+        a1 = numpy.array([0, 0])
+        a2 = numpy.array([3, 4])
         self.assertEqual(distance(a1, a2), 5)
         # vector should be the same as itself for any dimensions
-        a1 = array([1.3, 23, 5.4, 2.6, -1.2])
+        a1 = numpy.array([1.3, 23, 5.4, 2.6, -1.2])
         self.assertEqual(distance(a1, a1), 0)
         # should match hand-calculated case for an array
-        a1 = array([[1, -2], [3, 4]])
-        a2 = array([[1, 0], [-1, 2.5]])
+        a1 = numpy.array([[1, -2], [3, 4]])
+        a2 = numpy.array([[1, 0], [-1, 2.5]])
         self.assertEqual(distance(a1, a1), 0)
         self.assertEqual(distance(a2, a2), 0)
         self.assertEqual(distance(a1, a2), distance(a2, a1))
@@ -116,50 +121,102 @@ class CenterOfMassTests(TestCase):
 
     def test_sphere_points(self):
         """tests sphere points"""
-        assert_equal(sphere_points(1), array([[1.0, 0.0, 0.0]]))
+        assert_equal(sphere_points(1), numpy.array([[1.0, 0.0, 0.0]]))
 
 
 class TestAitchison(TestCase):
-    def setUp(self):
-        x = choice(20, size=10) + 0.1
-        self.x = x
-        a = arange(1, 7)
-        self.a = a
-        d = dirichlet(a, size=2)
-        self.d = d
+    @classmethod
+    def setUpClass(cls):
+        rng = default_rng(42)
+        cls.x = rng.integers(0, 20, size=10) + 0.1
+        cls.a = numpy.arange(1, 7)
+        cls.d = rng.dirichlet(cls.a, size=2)
+        # shape parameters >= 1 so no component underflows to 0
+        cls.z = rng.dirichlet(cls.x + 1)
+        cls.x1 = rng.dirichlet(cls.a)
 
     def test_Aitchison_transforms(self):
         """Test that alr_inv of alr is in fact the inverse
         of alr. Ditto for clr_inv and clr. Then test that clr
         transforms into hyperplane x1 + ... + xn=0."""
         length = len(self.x)
-        for col in range(-1, length):
-            y = alr_inv(self.x, col)
-            assert allclose(self.x, alr(y, col)), (
-                "Failed alr inverse test for col = " + str(col) + "."
-            )
-
-        z = dirichlet(self.x)
+        y = alr_inv(self.x)
+        assert numpy.allclose(self.x, alr(y)), "Failed alr inverse test."
+        cols = numpy.arange(-length - 1, length + 1)
+        y = alr_inv(self.x, cols)
+        for i, col in enumerate(cols):
+            assert_allclose(y[i], alr_inv(self.x, col))
+            assert_allclose(self.x, alr(y[i], col))
+        got = alr(y, cols)
+        for i, col in enumerate(cols):
+            assert_allclose(got[i], alr(y[i], col))
+        assert_allclose(got, numpy.tile(self.x, (len(cols), 1)))
+
+        z = self.z
         y = clr(z)
-        assert allclose(z, clr_inv(y)), "Failed clr inverse test."
-        assert allclose(sum(y), 0), "Failed clr hyperplane test."
+        assert numpy.allclose(z, clr_inv(y)), "Failed clr inverse test."
+        assert numpy.allclose(numpy.sum(y), 0), "Failed clr hyperplane test."
+
+    def test_alr_batched(self):
+        """scalar and batched col give the same result, including negatives"""
+        x = numpy.array([0.1, 1.1, 2.1, 3.1, 4.1])
+        for col in (-6, -3, -2, -1, 0, 2, 5):
+            assert_allclose(alr_inv(x, [col])[0], alr_inv(x, col))
+            assert_allclose(alr(alr_inv(x, col), col), x)
+        # col counts from the end of the returned composition
+        assert_allclose(alr_inv(x, -2)[-2], alr_inv(x, -2)[-1] / numpy.exp(x[-1]))
+        # a 2D x with a scalar col applies the same col to every row
+        data = numpy.array([x, x[::-1]])
+        got = alr_inv(data, 2)
+        for i, row in enumerate(data):
+            assert_allclose(got[i], alr_inv(row, 2))
+        assert_allclose(alr(got, 2), data)
+        # out of range cols raise for both scalar and sequence col
+        y = alr_inv(x)
+        for col in (6, -7, 100):
+            with self.assertRaises(IndexError):
+                alr_inv(x, col)
+            with self.assertRaises(IndexError):
+                alr_inv(x, [col])
+            with self.assertRaises(IndexError):
+                alr(y, col)
+            with self.assertRaises(IndexError):
+                alr(y, [col])
+        # an empty sequence of cols gives no rows
+        self.assertEqual(alr_inv(x, []).shape, (0, 6))
+        self.assertEqual(alr(y, []).shape, (0, 5))
+        # number of cols must match the number of rows
+        with self.assertRaises(ValueError):
+            alr_inv(data, [0, 1, 2])
+        with self.assertRaises(ValueError):
+            alr(got, [0, 1, 2])
+
+    def test_clr_2d(self):
+        """clr of a 2D array should transform each row independently"""
+        got = clr(self.d)
+        self.assertEqual(got.shape, self.d.shape)
+        for row, expect in zip(got, self.d):
+            assert numpy.allclose(row, clr(expect)), "Failed 2D clr test."
 
     def test_Aitchison_distance(self):
         x = self.d[0]
         y = self.d[1]
-        assert allclose(
+        assert numpy.allclose(
             aitchison_distance(x, y), norm(clr(x) - clr(y))
         ), "Failed distance test."
+        got = aitchison_distance(self.d, self.d[::-1])
+        assert numpy.allclose(
+            got, [aitchison_distance(x, y)] * 2
+        ), "Failed 2D distance test."
 
     def test_multiplicative_replacement(self):
-        x1 = dirichlet(self.a)
-        y1 = insert(x1, 3, 0)
+        y1 = numpy.insert(self.x1, 3, 0)
         u = multiplicative_replacement(y1)
-        assert allclose(
+        assert numpy.allclose(
             y1, u, atol=1e-2
         ), "Multiplicative replacement peturbation is too large."
-        assert isclose(
-            sum(u), 1
+        assert numpy.isclose(
+            numpy.sum(u), 1
         ), "Multiplicative replacement does not yield a composition."
 
 